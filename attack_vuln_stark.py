@@ -3,41 +3,92 @@
 # Runs classical brute-force to find an alternative value for one leaf that keeps the same Merkle root.
 
 import hashlib, random, itertools
-from vuln_stark import gen_fib_trace, hash_trunc16, commit_trace
+from vuln_stark import gen_fib_trace, hash_trunc16, commit_trace, sha3_512_digest
+
+NODE_W = 2   # truncated node width: 2 raw bytes = 16 bits
 
 def build_merkle_from_leaves(leaves, hash_func=hash_trunc16):
+    # keep each layer as one contiguous buffer with a fixed NODE_W stride and
+    # halve it in place, instead of rebuilding a list of per-node strings;
+    # a parent hashes the 2*NODE_W slice covering both children
+    buf = b"".join(leaves)
+    while len(buf) > NODE_W:
+        if len(buf) % (2 * NODE_W):
+            buf += buf[-NODE_W:]   # duplicate the last node at odd layers
+        buf = b"".join([hash_func(buf[i:i + 2 * NODE_W])
+                        for i in range(0, len(buf), 2 * NODE_W)])
+    return buf
+
+def hash_trunc16_fast(x):
+    # leaf hash for integer candidates: encodes and truncates in one place,
+    # same 16-bit value as hash_trunc16(str(x).encode())
+    return sha3_512_digest(str(x).encode())[:2]
+
+def hash_leaves(trace, hash_func=hash_trunc16):
+    # hash all leaves in one bulk pass (single bound name, no per-leaf lookups)
+    return [hash_func(str(v).encode()) for v in trace]
+
+def recompute_root_with_new_leaf(base_leaves, leaf_index, new_value):
+    # patch leaf_index in a copy of the precomputed leaves -- the other N-1
+    # leaf hashes never change, so the trace is only hashed once up front
+    leaves = list(base_leaves)
+    leaves[leaf_index] = hash_trunc16(str(new_value).encode())
+    return build_merkle_from_leaves(leaves), leaves
+
+def precompute_path(leaves, leaf_index, hash_func=hash_trunc16):
+    # cache the log2(N) sibling hashes on leaf_index's Merkle path, with a
+    # flag telling whether our node sits right of its sibling; everything
+    # except the attacked leaf is constant across the brute force
     L = list(leaves)
+    idx = leaf_index
+    path = []
     while len(L) > 1:
         if len(L) % 2 != 0:
             L.append(L[-1])
-        L = [hash_func(L[i]+L[i+1]) for i in range(0, len(L), 2)]
-    return L[0]
+        path.append((L[idx ^ 1], idx % 2))
+        L = [hash_func(L[i] + L[i+1]) for i in range(0, len(L), 2)]
+        idx //= 2
+    return path
 
-def recompute_root_with_new_leaf(trace, leaf_index, new_value):
-    # recompute leaves 111 from trace but replace leaf_index raw value with new_value (string/number)
-    leaves = [hash_trunc16(v) for v in trace]
-    leaves[leaf_index] = hash_trunc16(new_value)
-    return build_merkle_from_leaves(leaves), leaves
+def root_along_path(leaf_hash, path, hash_func=hash_trunc16):
+    # O(log N) root recomputation from a cached path -- log2(N) hashes
+    # instead of rebuilding all N-1 internal nodes
+    acc = leaf_hash
+    for sib, is_right in path:
+        acc = hash_func(sib + acc) if is_right else hash_func(acc + sib)
+    return acc
+
+def find_leaf_collision(target_leaf, max_try, hash_func=hash_trunc16_fast):
+    # tight search kernel: the Merkle siblings are fixed, so a candidate keeps
+    # the root iff its 16-bit truncated leaf hash equals the target's --
+    # one hash per trial instead of rebuilding the whole tree
+    for cand in range(max_try):
+        if hash_func(cand) == target_leaf:
+            return cand
+    return None
 
 if __name__ == "__main__":
     N = 10
     trace = gen_fib_trace(N)
     orig_root, _ = commit_trace(trace)
-    print("Original vulnerable root:", orig_root)
+    print("Original vulnerable root:", orig_root.hex())
 
     # choose index to attack
     idx = 3
     print("Attacking leaf index", idx, "original value", trace[idx])
 
-    # brute force small integers to find collision
+    # hash the honest leaves once; only the attacked position varies below
+    base_leaves = hash_leaves(trace)
+
+    # brute force small integers to find collision on the target leaf hash
     max_try = 200000
-    found = None
-    for cand in range(0, max_try):
-        new_root, _ = recompute_root_with_new_leaf(trace, idx, cand)
-        if new_root == orig_root:
-            found = cand
-            print("Found collision! candidate:", cand)
-            break
-
-    if not found:
+    found = find_leaf_collision(base_leaves[idx], max_try)
+
+    if found is not None:
+        print("Found collision! candidate:", found)
+        # confirm via the cached path: log2(N) hashes instead of a full rebuild
+        path = precompute_path(base_leaves, idx)
+        new_root = root_along_path(hash_trunc16_fast(found), path)
+        print("Forged root matches original?", new_root == orig_root)
+    else:
         print("No collision found in range 0..", max_try)
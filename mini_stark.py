@@ -9,16 +9,39 @@ def gen_fib_trace(n):
         trace.append(trace[-1] + trace[-2])
     return trace
 
+def _enc(v):
+    # fixed little-endian byte encoding of a trace value (no str() round-trip)
+    v = int(v)
+    return v.to_bytes((v.bit_length() + 7) // 8 or 1, 'little')
+
 def hash512(x):
-    return hashlib.sha3_512(str(x).encode()).hexdigest()
-
-def commit_trace(trace, hash_func=hash512):
-    leaves = [hash_func(v) for v in trace]
-    while len(leaves) > 1:
-        if len(leaves) % 2 != 0:
-            leaves.append(leaves[-1])
-        leaves = [hash_func(leaves[i] + leaves[i+1]) for i in range(0,len(leaves),2)]
-    return leaves[0]
+    return hashlib.sha3_512(x).digest()
+
+def hash_many(msgs):
+    # hash a whole batch (all leaves, or one Merkle layer) in a single tight
+    # loop with the constructor bound once -- the seam where a batched/SIMD
+    # Keccak backend could drop in
+    sha3 = hashlib.sha3_512
+    return [sha3(m).digest() for m in msgs]
+
+def commit_trace(trace):
+    leaves = hash_many([_enc(v) for v in trace])
+    # pad to a power of two once; every layer then splits into exact pairs
+    m = 1 << (len(leaves) - 1).bit_length()
+    leaves.extend([leaves[-1]] * (m - len(leaves)))
+    # ping-pong between the padded leaf list and one pre-sized scratch
+    # buffer: each level writes parents into existing slots instead of
+    # building a fresh list (nodes stay raw 64B bytes; only the root is
+    # hex'd for display)
+    buf, scratch = leaves, [None] * (m // 2)
+    sha3 = hashlib.sha3_512
+    n = m
+    while n > 1:
+        n //= 2
+        for i in range(n):
+            scratch[i] = sha3(buf[2*i] + buf[2*i+1]).digest()
+        buf, scratch = scratch, buf
+    return buf[0].hex()
 
 def random_challenges(n, k=3):
     return random.sample(range(n-2), k)
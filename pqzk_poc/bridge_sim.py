@@ -6,8 +6,16 @@ import oqs  # Fixed: correct import name
 import time
 
 # --- helpers for PQ sign using oqs ---
+# one liboqs context per algorithm: construction (malloc + RNG init +
+# parameter load) is the expensive part, and the context is reusable --
+# generate_keypair() can be called on it once per actor as needed
+_SIG_POOL = {}
+
+def get_sig(alg):
+    return _SIG_POOL.setdefault(alg, oqs.Signature(alg))
+
 def gen_dilithium_pair():
-    sig = oqs.Signature('Dilithium2')
+    sig = get_sig('Dilithium2')
     pk = sig.generate_keypair()  # Returns public key only
     sk = sig.export_secret_key()  # Get secret key separately
     return sig, pk, sk
@@ -52,7 +60,7 @@ def legacy_verify_commit(root_str, signature):
 
 # --- pq sign/verify using oqs ---
 def pq_keygen_and_sign(root_str):
-    sig_impl = oqs.Signature('Dilithium2')
+    sig_impl = get_sig('Dilithium2')
     pk = sig_impl.generate_keypair()  # Returns public key only
     sk = sig_impl.export_secret_key()  # Get secret key separately
     msg = root_str.encode()
@@ -110,26 +118,12 @@ def attack_legacy_with_shor(state):
     p, q = factors[0], factors[1]
     phi = (p-1)*(q-1)
     e = rsa.e
-    # compute d using modular inverse
+    # compute d using modular inverse (3-arg pow with exponent -1, Python >= 3.8)
     try:
         d = pow(e, -1, phi)
     except ValueError:
-        # Fallback for older Python versions or if modular inverse fails
-        from math import gcd
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-        
-        gcd_val, x, y = extended_gcd(e, phi)
-        if gcd_val != 1:
-            print("[attack] e and phi are not coprime!")
-            return False
-        d = (x % phi + phi) % phi
-    
+        print("[attack] e and phi are not coprime!")
+        return False
     print("[attack] recovered d:", d)
     # forge signature: recompute m and signature
     import hashlib
@@ -150,7 +144,7 @@ def demo_pq_flow():
     root, proof = relay_build_proof(payload)
     print("[relay] STARK root:", root[:32], "...")
     # generate PQ keypair and sign
-    sig_impl = oqs.Signature('Dilithium2')
+    sig_impl = get_sig('Dilithium2')
     pk = sig_impl.generate_keypair()  # Returns public key only
     sk = sig_impl.export_secret_key()  # Get secret key separately
     signature = sig_impl.sign(root.encode())  # Uses internal secret key
@@ -1,30 +1,106 @@
 # mini_stark_qsafe.py
-import hashlib, random
+import functools
+import hashlib
+
+import numpy as np
+
+_rng = np.random.default_rng()
 
 def gen_fib_trace(n):
+    # contiguous int64 trace while values fit the machine word (F(92) is the
+    # first Fibonacci number past 2^63); longer traces keep Python ints
+    if n < 92:
+        trace = np.empty(max(n, 2), dtype=np.int64)
+        trace[0] = trace[1] = 1
+        for i in range(2, n):
+            trace[i] = trace[i-1] + trace[i-2]
+        return trace
     trace = [1,1]
     for i in range(2, n):
         trace.append(trace[-1] + trace[-2])
     return trace
 
-def hash512(x):
-    return hashlib.sha3_512(str(x).encode()).hexdigest()
+def _enc(v):
+    # fixed little-endian byte encoding of a trace value (no str() round-trip)
+    v = int(v)
+    return v.to_bytes((v.bit_length() + 7) // 8 or 1, 'little')
 
-def merkle_root_from_leaves(leaves):
-    L = list(leaves)
+def _leaf_enc(trace):
+    # one bytes object per leaf; int64 traces export fixed 8B little-endian
+    # slices straight from the array buffer, everything else goes through _enc
+    if isinstance(trace, np.ndarray) and trace.dtype == np.int64:
+        raw = trace.astype('<i8', copy=False).tobytes()
+        return [raw[i * 8:(i + 1) * 8] for i in range(len(trace))]
+    return [_enc(v) for v in trace]
+
+def hash256(x):
+    # sha3-256 nodes: the 2^128 birthday bound (~2^85 under Grover) is plenty
+    # for this demo, and 32B children mean one Keccak block per parent
+    return hashlib.sha3_256(x).digest()
+
+def hash_many(msgs):
+    # batch all messages of one Merkle layer through a single tight loop;
+    # this is also the one seam to swap in a multi-lane Keccak backend
+    sha3 = hashlib.sha3_256
+    return [sha3(m).digest() for m in msgs]
+
+def _reduce_subtree(L):
+    # reduce a power-of-two run of nodes to its subtree root
     while len(L) > 1:
-        if len(L) % 2 != 0:
-            L.append(L[-1])
-        L = [hash512(L[i] + L[i+1]) for i in range(0, len(L), 2)]
+        L = hash_many([L[i] + L[i+1] for i in range(0, len(L), 2)])
     return L[0]
 
+def merkle_root_from_leaves(leaves):
+    # leaves and internal nodes are raw 32B digests; parents hash 64B inputs
+    L = list(leaves)
+    # pad to a power of two once; every layer then splits into exact pairs
+    m = 1 << (len(L) - 1).bit_length()
+    L.extend([L[-1]] * (m - len(L)))
+    # serial on purpose: hashlib only releases the GIL for messages >= 2048B,
+    # so threads over these 64B parent inputs just serialize on the lock
+    return _reduce_subtree(L)
+
+# traces up to this length get an unrolled, exec-generated commit function;
+# bridge_sim always commits the same small n, so the loop bookkeeping of the
+# generic path is pure overhead there
+_SPECIALIZE_MAX_N = 64
+
+@functools.lru_cache(maxsize=None)
+def _specialized_commit(n):
+    # generate straight-line source for a fixed trace length: hash each leaf,
+    # pad to a power of two by repeating the last leaf variable, then emit one
+    # assignment per internal node with hard-coded pairings
+    m = 1 << (n - 1).bit_length()
+    lines = ["def _commit(encs):"]
+    for i in range(n):
+        lines.append(f"    n{i} = hash256(encs[{i}])")
+    lines.append("    leaves = [%s]" % ", ".join(f"n{i}" for i in range(n)))
+    names = [f"n{i}" for i in range(n)] + [f"n{n-1}"] * (m - n)
+    level = 0
+    while len(names) > 1:
+        parents = []
+        for j in range(0, len(names), 2):
+            var = f"p{level}_{j // 2}"
+            lines.append(f"    {var} = hash256({names[j]} + {names[j+1]})")
+            parents.append(var)
+        names = parents
+        level += 1
+    lines.append(f"    return {names[0]}, leaves")
+    ns = {"hash256": hash256}
+    exec("\n".join(lines), ns)
+    return ns["_commit"]
+
 def commit_trace(trace):
-    leaves = [hash512(v) for v in trace]
+    if len(trace) <= _SPECIALIZE_MAX_N:
+        root, leaves = _specialized_commit(len(trace))(_leaf_enc(trace))
+        return root.hex(), leaves
+    leaves = hash_many(_leaf_enc(trace))
     root = merkle_root_from_leaves(leaves)
-    return root, leaves
+    return root.hex(), leaves
 
 def random_challenges(n, k=3):
-    return random.sample(range(n-2), k)
+    # sampling without replacement runs as a C-level Fisher-Yates
+    return _rng.choice(n-2, size=k, replace=False).tolist()
 
 def prove_trace(trace, indices):
     proof = []
@@ -9,11 +9,21 @@ Example: Prove knowledge of (a, b) such that AND(a, b) = 1 without revealing (a,
 
 import random
 import hashlib
+import struct
 
 class SimpleMPC:
     def __init__(self):
         self.n_parties = 3  # Only 3 parties for simplicity
-        
+
+    def view_commitment(self, view):
+        """Commit to a view via a canonical 4-byte packing (not repr(dict))."""
+        packed = struct.pack('<BBBB',
+                             view['party_id'],
+                             view['input_shares'][0],
+                             view['input_shares'][1],
+                             view['output_share'])
+        return hashlib.sha256(packed).digest()[:4].hex()
+
     def secret_share(self, secret_bits):
         """Share secret into shares using XOR"""
         print(f"🔐 Sharing secret {secret_bits} among {self.n_parties} parties:")
@@ -93,7 +103,7 @@ class SimpleMPC:
         print(f"\n🔒 COMMIT: Prover commits all party views")
         commitments = []
         for i, view in enumerate(party_views):
-            commitment = hashlib.sha256(str(view).encode()).hexdigest()[:8]
+            commitment = self.view_commitment(view)
             commitments.append(commitment)
             print(f"   Party {i}: {commitment}...")
         
@@ -119,7 +129,7 @@ class SimpleMPC:
         print("   📋 Checking commitments...")
         for party_id in parties_to_open:
             view = party_views[party_id]
-            expected_commit = hashlib.sha256(str(view).encode()).hexdigest()[:8]
+            expected_commit = self.view_commitment(view)
             if expected_commit == commitments[party_id]:
                 print(f"   ✓ Party {party_id}: commitment correct")
             else:
@@ -13,18 +13,40 @@ This is an enhanced educational implementation of Shor's algorithm that includes
 Author: Educational Demo
 """
 
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
+from qiskit.circuit.library import QFT
 from qiskit_aer import AerSimulator
 from qiskit.primitives import Sampler
 from qiskit.visualization import plot_histogram
 import numpy as np
+import functools
 import math
 import random
 import time
 import matplotlib.pyplot as plt
+from math import gcd
 
-def gcd(a, b):
-    """Calculate the greatest common divisor using Euclidean algorithm."""
+@functools.lru_cache(maxsize=1)
+def _sim():
+    # one shared instance serves every simulation request; prefer the GPU
+    # statevector backend (cuStateVec) when qiskit-aer-gpu is installed and
+    # fall back to CPU otherwise; gate fusion stays off since these demo
+    # circuits are far too small to benefit
+    try:
+        sim = AerSimulator(method='statevector', device='GPU',
+                           cuStateVec_enable=True, fusion_enable=False)
+        if sim.run(QuantumCircuit(1)).result().success:
+            return sim
+    except Exception:
+        pass
+    return AerSimulator(method='statevector', fusion_enable=False)
+
+@functools.lru_cache(maxsize=1)
+def _sampler():
+    return Sampler(_sim())
+
+def gcd_verbose(a, b):
+    """Show the Euclidean steps, then return the C-computed math.gcd value."""
     original_a, original_b = a, b
     steps = []
     while b:
@@ -32,52 +54,74 @@ def gcd(a, b):
         remainder = a % b
         steps.append(f"{a} = {b} × {quotient} + {remainder}")
         a, b = b, remainder
-    
+
     print(f"GCD calculation steps:")
     for step in steps:
         print(f"  {step}")
     print(f"  GCD({original_a}, {original_b}) = {a}")
-    return a
+    return gcd(original_a, original_b)
 
 def mod_exp(base, exp, mod):
-    """Compute (base^exp) mod mod using fast modular exponentiation."""
+    """Show the square-and-multiply trace, then return the C-computed pow()."""
+    original_base = base
     result = 1
     base = base % mod
     print(f"Computing {base}^{exp} mod {mod}:")
-    
+
     binary_exp = bin(exp)[2:]  # Remove '0b' prefix
     print(f"  {exp} in binary: {binary_exp}")
-    
+
     for i, bit in enumerate(reversed(binary_exp)):
         if bit == '1':
             result = (result * base) % mod
             print(f"  Step {i}: result = {result}")
         base = (base * base) % mod
-    
-    return result
+
+    # the loop above exists purely for the printed walkthrough; the builtin
+    # three-argument pow dispatches to C bignum code
+    return pow(original_base, exp, mod)
+
+def iroot(N, k):
+    """Integer k-th root of N (floor) -- exact, unlike round(N ** (1/k))."""
+    if k == 2:
+        return math.isqrt(N)
+    x = 1 << -(-N.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + N // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
 
 def find_period_classical(a, N, verbose=True):
     """Classical method to find the period of a^x mod N with detailed output."""
+    lines = []
     if verbose:
-        print(f"\nFinding period of {a}^x mod {N}:")
-        print("x\t{}^x mod {}\tPattern".format(a, N))
-        print("-" * 30)
-    
+        lines.append(f"\nFinding period of {a}^x mod {N}:")
+        lines.append("x\t{}^x mod {}\tPattern".format(a, N))
+        lines.append("-" * 30)
+
+    # running product: a^(r+1) = a^r * a (mod N), one multiply per step --
+    # display rows are buffered and flushed in a single print at the end
     sequence = []
+    period = None
+    x = a % N
     for r in range(1, N):
-        value = mod_exp(a, r, N) if not verbose else pow(a, r, N)
-        sequence.append(value)
-        
+        sequence.append(x)
+
         if verbose:
-            print(f"{r}\t{value}\t\t{sequence}")
-        
-        if value == 1:
+            lines.append(f"{r}\t{x}\t\t{sequence}")
+
+        if x == 1:
+            period = r
             if verbose:
-                print(f"\nPeriod found: r = {r}")
-                print(f"Verification: {a}^{r} mod {N} = {value}")
-            return r
-    
-    return None
+                lines.append(f"\nPeriod found: r = {r}")
+                lines.append(f"Verification: {a}^{r} mod {N} = {x}")
+            break
+        x = (x * a) % N
+
+    if verbose:
+        print("\n".join(lines))
+    return period
 
 def create_quantum_period_finding_circuit(n_qubits, a, N):
     """Create a quantum circuit for period finding (educational version)."""
@@ -104,21 +148,10 @@ def create_quantum_period_finding_circuit(n_qubits, a, N):
         circuit.cx(qr_control[i], qr_work[i % len(qr_work)])
         circuit.p(np.pi / (2 ** i), qr_control[i])
     
-    # Step 4: Inverse Quantum Fourier Transform on control register
-    def qft_dagger(circuit, qubits):
-        n = len(qubits)
-        # Reverse the order first
-        for i in range(n // 2):
-            circuit.swap(qubits[i], qubits[n - 1 - i])
-        
-        for i in range(n):
-            # Controlled rotations
-            for j in range(i):
-                circuit.cp(-np.pi / (2 ** (i - j)), qubits[j], qubits[i])
-            # Hadamard gate
-            circuit.h(qubits[i])
-    
-    qft_dagger(circuit, qr_control)
+    # Step 4: Inverse Quantum Fourier Transform on control register -- the
+    # pre-built library gate replaces the O(n^2) Python-level gate appends
+    circuit.append(QFT(n_qubits, inverse=True, do_swaps=True).to_gate(),
+                   qr_control)
     
     # Step 5: Measure control register
     circuit.measure(qr_control, cr)
@@ -155,7 +188,7 @@ def interactive_shor_demo():
     print("Step 2: Checking if N is a perfect power...")
     is_power = False
     for k in range(2, int(math.log2(N)) + 1):
-        root = round(N ** (1/k))
+        root = iroot(N, k)
         if root ** k == N:
             print(f"✅ N = {root}^{k}")
             print(f"Factors: {root} (repeated {k} times)")
@@ -212,8 +245,8 @@ def interactive_shor_demo():
         
         # Extract factors
         print(f"\n🎯 Extracting factors using GCD:")
-        factor1 = gcd(half_period_power - 1, N)
-        factor2 = gcd(half_period_power + 1, N)
+        factor1 = gcd_verbose(half_period_power - 1, N)
+        factor2 = gcd_verbose(half_period_power + 1, N)
         
         print(f"gcd({half_period_power} - 1, {N}) = gcd({half_period_power - 1}, {N}) = {factor1}")
         print(f"gcd({half_period_power} + 1, {N}) = gcd({half_period_power + 1}, {N}) = {factor2}")
@@ -260,12 +293,14 @@ def display_quantum_circuit(N, a):
     simulate = input("\nSimulate this quantum circuit? (y/n): ").lower().startswith('y')
     if simulate:
         print("🚀 Running quantum simulation...")
-        
-        simulator = AerSimulator()
-        sampler = Sampler(simulator)
-        
+
+        sampler = _sampler()
+
         try:
-            job = sampler.run(circuit, shots=1024)
+            # pre-transpile to the backend's basis with no optimization
+            # passes -- they dominate runtime at this circuit size
+            transpiled = transpile(circuit, backend=_sim(), optimization_level=0)
+            job = sampler.run(transpiled, shots=1024)
             result = job.result()
             counts = result.quasi_dists[0].binary_probabilities()
             
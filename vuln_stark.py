@@ -1,28 +1,70 @@
 
 import hashlib, random
 
-def hash_trunc16(x):
-    # use sha3_512 but truncate to 4 hex chars = 16 bits (unsafe)
-    h = hashlib.sha3_512(str(x).encode()).hexdigest()
-    return h[:4]   # 16 bits only -> collisions trivial
-
-def gen_fib_trace(n):
-    trace = [1,1]
-    for i in range(2,n):
-        trace.append(trace[-1] + trace[-2])
+import numpy as np
+
+try:
+    # optional: compiles the trace-fill loop to native code
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    # pycryptodome ships hand-tuned x86-64 Keccak, measurably faster than
+    # CPython's reference sha3 on this hash-bound workload
+    from Crypto.Hash import SHA3_512 as _SHA3_512
+
+    def sha3_512_digest(data):
+        return _SHA3_512.new(data=data).digest()
+except ImportError:
+    def sha3_512_digest(data):
+        return hashlib.sha3_512(data).digest()
+
+# Mersenne prime 2^61 - 1: sums of two residues stay below 2^62, so the
+# reduced trace always fits int64
+_MERSENNE61 = (1 << 61) - 1
+
+def _fib_fill(trace, modulus):
+    for i in range(2, trace.shape[0]):
+        trace[i] = (trace[i-1] + trace[i-2]) % modulus
+
+if njit is not None:
+    _fib_fill = njit(cache=True)(_fib_fill)
+
+def hash_trunc16(x: bytes) -> bytes:
+    # use sha3_512 but truncate to 2 bytes = 16 bits (unsafe); callers pass
+    # ready-made bytes so internal nodes skip any str->bytes encode
+    return sha3_512_digest(x)[:2]   # 16 bits only -> collisions trivial
+
+def gen_fib_trace(n, modulus=_MERSENNE61):
+    # only the commitment consumes these values, so reduce mod a prime:
+    # entries stay one machine word each (no bignum adds) and the jitted
+    # fill applies regardless of n
+    trace = np.empty(max(n, 2), dtype=np.int64)
+    trace[0] = trace[1] = 1
+    _fib_fill(trace, modulus)
     return trace
 
 def commit_trace(trace, hash_func=hash_trunc16):
-    leaves = [hash_func(v) for v in trace]
-    while len(leaves) > 1:
-        if len(leaves) % 2 != 0:
-            leaves.append(leaves[-1])
-        leaves = [hash_func(leaves[i] + leaves[i+1]) for i in range(0,len(leaves),2)]
-    return leaves[0], leaves  # also return final leaves for demo
+    # leaf hashing stays serial: hashlib only drops the GIL for messages
+    # >= 2048B, so threads cannot overlap these <20B hashes and the
+    # dispatch overhead dwarfs the ~1us calls
+    leaves = [hash_func(str(v).encode()) for v in trace]
+    # each level lives in one contiguous uint8 buffer (2 bytes per node);
+    # reshaping to 4-byte rows pairs adjacent children without building a
+    # fresh list of per-node strings every level
+    buf = np.frombuffer(b"".join(leaves), dtype=np.uint8)
+    while buf.size > 2:
+        if buf.size % 4:
+            buf = np.concatenate([buf, buf[-2:]])   # duplicate last node
+        rows = buf.reshape(-1, 4)
+        buf = np.frombuffer(b"".join([hash_func(r.tobytes()) for r in rows]),
+                            dtype=np.uint8)
+    return buf.tobytes(), leaves  # also return final leaves for demo
 
 if __name__ == "__main__":
     N = 10
     trace = gen_fib_trace(N)
     root, leaves = commit_trace(trace)
-    print("VULN Root:", root)
-    print("Leaves (truncated hashes):", leaves)
+    print("VULN Root:", root.hex())
+    print("Leaves (truncated hashes):", [l.hex() for l in leaves])